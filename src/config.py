@@ -4,8 +4,18 @@ Some constants for the Flight Management System
 
 DB_PATH = "flight_management.db"
 
-VALID_STATUSES = {'Scheduled', 'Boarding', 'Departed', 'Cancelled', 'Delayed'}
-VALID_RANKS = {'Captain', 'First Officer'}
+# Flight.status stores the position in this tuple plus one (1 = Scheduled ... 5 = Delayed)
+FLIGHT_STATUSES = ('Scheduled', 'Boarding', 'Departed', 'Cancelled', 'Delayed')
+
+# Status name -> code stored in Flight.status
+STATUS_IDS = {s: i for i, s in enumerate(FLIGHT_STATUSES, start=1)}
+
+VALID_STATUSES = frozenset(FLIGHT_STATUSES)
+VALID_RANKS = frozenset(('Captain', 'First Officer'))
+
+# Case-insensitive lookups: lower-cased input -> canonical spelling
+STATUS_LOOKUP = {s.lower(): s for s in VALID_STATUSES}
+RANK_LOOKUP = {r.lower(): r for r in VALID_RANKS}
 
 DATE_FORMAT = '%Y-%m-%d'
 DATETIME_FORMAT = '%Y-%m-%d %H:%M'
@@ -4,37 +4,100 @@ Initialise database and handle connection management for the Flight Management S
 
 import sqlite3
 import os
+import atexit
 from contextlib import contextmanager
+from typing import Optional
 from config import DB_PATH
 from models import DatabaseError
 
 
+_conn: Optional[sqlite3.Connection] = None # Shared connection, opened on first use
+_wal_enabled = False # journal_mode is stored in the file, so WAL only needs switching on once per file
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the shared connection and apply the per-connection settings once"""
+
+    global _wal_enabled
+    # Autocommit at the driver level, transactions are started explicitly with BEGIN
+    # SQL lives in module-level _SQL_* constants, so a 256-entry statement cache keeps
+    # each one compiled once and reused for the life of the shared connection
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    conn.row_factory = sqlite3.Row # Return rows as dictionaries
+    conn.execute("PRAGMA foreign_keys = ON;") # Enable foreign key constraints
+    conn.execute("PRAGMA synchronous = NORMAL;") # No fsync per commit, safe under WAL
+    conn.execute("PRAGMA temp_store = MEMORY;") # Keep temporary tables and indices in memory
+    conn.execute("PRAGMA cache_size = -64000;") # ~64 MB page cache
+    conn.execute("PRAGMA mmap_size = 268435456;") # Memory-map up to 256 MB of the file
+    conn.execute("PRAGMA busy_timeout = 5000;") # Wait up to 5s for another writer instead of failing
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode = WAL;") # Readers don't block the writer and vice versa
+        _wal_enabled = True
+    return conn
+
+
 @contextmanager
 def get_connection():
     """Context manager for database connection
+
+    Yields the shared connection instead of opening a new one for every operation
     """
 
-    conn = sqlite3.connect(DB_PATH) # Open connection to the database
-    conn.row_factory = sqlite3.Row # Return rows as dictionaries
-    conn.execute("PRAGMA foreign_keys = ON;") # Enable foreign key constraints
+    global _conn
+    if _conn is None:
+        _conn = _connect()
+    conn = _conn
     try: 
         yield conn # Provide the connection 
     except sqlite3.Error as e:
-        conn.rollback() # Roll back transaction on error
         raise DatabaseError(f"Database Error: {e}")
     finally:
-        conn.close() # close the connection
+        # Discard anything left uncommitted, as closing the connection used to
+        if conn.in_transaction:
+            conn.rollback()
+
+
+@contextmanager
+def transaction():
+    """Context manager for a write on the shared connection
+
+    Wraps the block in BEGIN IMMEDIATE ... COMMIT, an exception leaves the
+    transaction open and get_connection rolls it back
+    """
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.execute("COMMIT")
+
+
+def close_connection() -> None:
+    """Close the shared connection if it is open"""
+
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+
+atexit.register(close_connection)
 
 
 def initialise_tables() -> None:
     """Initialise the database by creating tables and seeding initial data."""
 
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH) # Remove existing database file to start fresh
+    global _wal_enabled
+    close_connection() # Release the file before it is removed
+    for path in (DB_PATH, DB_PATH + "-wal", DB_PATH + "-shm"):
+        if os.path.exists(path):
+            os.remove(path) # Remove existing database (and WAL) files to start fresh
+    _wal_enabled = False # The new file starts in rollback-journal mode
     try:
         with get_connection() as conn:
             _create_tables(conn) # Create  tables
             _generate_data(conn) # Insert initial seed data
+            _create_triggers(conn) # Keep flight_details_mv in sync from now on
             conn.commit() # Commit all changes
     except Exception as e: 
         print(f"Database Error: {e}") # If error raise...
@@ -82,13 +145,6 @@ def _create_tables(conn: sqlite3.Connection) -> None:
         ON Pilot (UPPER(TRIM(licence_no)));
         """,
         """
-        CREATE TABLE IF NOT EXISTS FlightStatus (
-            status_id INTEGER PRIMARY KEY,
-            status_name TEXT UNIQUE NOT NULL
-            CHECK (status_name IN ('Scheduled','Boarding','Departed','Cancelled','Delayed'))
-        );
-        """,
-        """
         CREATE TABLE IF NOT EXISTS Flight(
             flight_id INTEGER PRIMARY KEY AUTOINCREMENT,
             flight_number TEXT NOT NULL,
@@ -96,9 +152,8 @@ def _create_tables(conn: sqlite3.Connection) -> None:
             route_id INTEGER NOT NULL,
             sched_dep_utc DATETIME NOT NULL ,
             sched_arr_utc DATETIME NOT NULL CHECK (datetime(sched_arr_utc) > datetime(sched_dep_utc)),
-            status_id INTEGER NOT NULL,
+            status SMALLINT NOT NULL CHECK (status BETWEEN 1 AND 5), -- position in config.FLIGHT_STATUSES + 1
             FOREIGN KEY (route_id) REFERENCES Route(route_id) ON DELETE RESTRICT,
-            FOREIGN KEY (status_id) REFERENCES FlightStatus(status_id) ON DELETE RESTRICT,
             UNIQUE (flight_number, flight_date)
         );
         """,
@@ -117,6 +172,10 @@ def _create_tables(conn: sqlite3.Connection) -> None:
         ON CrewAssignment (flight_id, role);
         """,
         """
+        CREATE INDEX IF NOT EXISTS idx_crew_pilot_role
+        ON CrewAssignment (pilot_id, role, flight_id);
+        """,
+        """
         CREATE VIEW IF NOT EXISTS v_flight_details AS
         SELECT
             f.flight_id,
@@ -124,7 +183,13 @@ def _create_tables(conn: sqlite3.Connection) -> None:
             f.flight_date,
             r.origin_code,
             r.dest_code,
-            fs.status_name,
+            CASE f.status
+                WHEN 1 THEN 'Scheduled'
+                WHEN 2 THEN 'Boarding'
+                WHEN 3 THEN 'Departed'
+                WHEN 4 THEN 'Cancelled'
+                WHEN 5 THEN 'Delayed'
+            END AS status_name,
             f.sched_dep_utc,
             f.sched_arr_utc,
             cap.first_name || ' ' || cap.last_name AS captain_name,
@@ -133,7 +198,6 @@ def _create_tables(conn: sqlite3.Connection) -> None:
             fo.pilot_id AS fo_id
         FROM Flight f
         JOIN Route r ON f.route_id = r.route_id
-        JOIN FlightStatus fs ON f.status_id = fs.status_id
         LEFT JOIN CrewAssignment ca_cap
             ON ca_cap.flight_id = f.flight_id AND ca_cap.role = 'Captain'
         LEFT JOIN Pilot cap ON cap.pilot_id = ca_cap.pilot_id
@@ -144,6 +208,54 @@ def _create_tables(conn: sqlite3.Connection) -> None:
         """
         CREATE INDEX IF NOT EXISTS idx_flight_dest_date
         ON Flight (route_id, flight_date);
+        """,
+        # Materialised copy of v_flight_details (same columns, same order) so reads
+        # don't have to re-run the joins. Kept up to date by the triggers below
+        """
+        CREATE TABLE IF NOT EXISTS flight_details_mv(
+            flight_id INTEGER PRIMARY KEY,
+            flight_number TEXT NOT NULL,
+            flight_date DATE NOT NULL,
+            origin_code TEXT NOT NULL,
+            dest_code TEXT NOT NULL,
+            status_name TEXT NOT NULL,
+            sched_dep_utc DATETIME NOT NULL,
+            sched_arr_utc DATETIME NOT NULL,
+            captain_name TEXT,
+            captain_id INTEGER,
+            fo_name TEXT,
+            fo_id INTEGER
+        );
+        """,
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_flight_lookup
+        ON flight_details_mv (flight_number, flight_date);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_date_dep
+        ON flight_details_mv (flight_date, sched_dep_utc);
+        """,
+        # Serves origin filters as a prefix, and the per-route GROUP BY without a sort
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_route
+        ON flight_details_mv (origin_code, dest_code);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_dest
+        ON flight_details_mv (dest_code);
+        """,
+        # Covers the per-destination count over a date range
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_date_dest
+        ON flight_details_mv (flight_date, dest_code);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_status
+        ON flight_details_mv (status_name);
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_captain
+        ON flight_details_mv (captain_id);
         """
     ]
     
@@ -151,10 +263,80 @@ def _create_tables(conn: sqlite3.Connection) -> None:
         cur.execute(query)
 
 
-def _generate_data(conn: sqlite3.Connection) -> None:
-    seed_sql = """
-    /* Insert Airports */
-    INSERT INTO Airport (airport_code, name, city, country, utc_offset, tz_name) VALUES
+def _create_triggers(conn: sqlite3.Connection) -> None:
+    """Create the triggers that refresh the affected rows of flight_details_mv"""
+
+    cur = conn.cursor()
+
+    queries = [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flight_insert AFTER INSERT ON Flight
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id = NEW.flight_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flight_update AFTER UPDATE ON Flight
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id = NEW.flight_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_flight_delete AFTER DELETE ON Flight
+        BEGIN
+            DELETE FROM flight_details_mv WHERE flight_id = OLD.flight_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_crew_insert AFTER INSERT ON CrewAssignment
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id = NEW.flight_id;
+        END;
+        """,
+        # Delete then insert rather than INSERT OR REPLACE: when the UPDATE comes from an
+        # upsert's DO UPDATE, SQLite applies the outer statement's ABORT to the trigger body
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_crew_update AFTER UPDATE ON CrewAssignment
+        BEGIN
+            DELETE FROM flight_details_mv WHERE flight_id IN (OLD.flight_id, NEW.flight_id);
+            INSERT INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id IN (OLD.flight_id, NEW.flight_id);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_crew_delete AFTER DELETE ON CrewAssignment
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id = OLD.flight_id;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_pilot_update AFTER UPDATE OF first_name, last_name ON Pilot
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details
+            WHERE flight_id IN (SELECT flight_id FROM CrewAssignment WHERE pilot_id = NEW.pilot_id);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_route_update AFTER UPDATE OF origin_code, dest_code ON Route
+        WHEN OLD.origin_code IS NOT NEW.origin_code OR OLD.dest_code IS NOT NEW.dest_code
+        BEGIN
+            INSERT OR REPLACE INTO flight_details_mv
+            SELECT * FROM v_flight_details WHERE flight_id IN (SELECT flight_id FROM Flight WHERE route_id = NEW.route_id);
+        END;
+        """
+    ]
+
+    for query in queries:
+        cur.execute(query)
+
+
+# Seed rows per table, loaded with one executemany each
+_SEED_AIRPORTS = [
     ('LHR','Heathrow','London','United Kingdom', 0.0,'Europe/London'),
     ('LGW','Gatwick','London','United Kingdom', 0.0,'Europe/London'),
     ('MAN','Manchester','Manchester','United Kingdom', 0.0,'Europe/London'),
@@ -169,10 +351,10 @@ def _generate_data(conn: sqlite3.Connection) -> None:
     ('HND','Haneda','Tokyo','Japan',9.0,'Asia/Tokyo'),
     ('YYZ','Pearson','Toronto','Canada',-5.0,'America/Toronto'),
     ('DEL', 'Indira Gandhi Intl', 'Delhi', 'India', 5.5, 'Asia/Kolkata'),
-    ('ATL','Hartsfield-Jackson','Atlanta','United States',-5.0,'America/New_York');
+    ('ATL','Hartsfield-Jackson','Atlanta','United States',-5.0,'America/New_York'),
+]
 
-    /* Insert Routes */
-    INSERT INTO Route (origin_code,dest_code,distance_km,flight_duration_mins) VALUES
+_SEED_ROUTES = [
     ('LHR','JFK', 5556, 420),
     ('LHR','DXB', 5500, 415),
     ('LGW','AMS',  358,   60),
@@ -187,18 +369,10 @@ def _generate_data(conn: sqlite3.Connection) -> None:
     ('YYZ','DEL',   702,  90),
     ('DEL','ATL',   975, 110),
     ('ATL','LHR',  6763, 460),
-    ('MAN','YYZ',  5410, 400);
-
-    /* Insert Flight Status */
-    INSERT INTO FlightStatus (status_id, status_name) VALUES
-    (1, 'Scheduled'),
-    (2, 'Boarding'),
-    (3, 'Departed'),
-    (4, 'Cancelled'),
-    (5, 'Delayed');
-
-    /* Insert Pilots */
-    INSERT INTO Pilot (licence_no, first_name, last_name, rank, hire_date) VALUES
+    ('MAN','YYZ',  5410, 400),
+]
+
+_SEED_PILOTS = [
     ('LIC1001','Alice','Adams','Captain','2015-04-12'),
     ('LIC1002','Bob','Barker','Captain','2012-09-30'),
     ('LIC1003','Cara','Chen','First Officer','2019-06-18'),
@@ -213,10 +387,10 @@ def _generate_data(conn: sqlite3.Connection) -> None:
     ('LIC1012','Leo','Lopez','First Officer','2017-12-12'),
     ('LIC1013','Mia','Moore','Captain','2009-09-09'),
     ('LIC1014','Ned','Nguyen','First Officer','2023-01-15'),
-    ('LIC1015','Ola','Olsen','Captain','2016-06-06');
+    ('LIC1015','Ola','Olsen','Captain','2016-06-06'),
+]
 
-    /* Insert Flights */
-    INSERT INTO Flight (flight_number, flight_date, route_id, sched_dep_utc, sched_arr_utc, status_id) VALUES
+_SEED_FLIGHTS = [
     ('BA101','2025-06-05',1,'2025-06-05 08:00','2025-06-05 15:00',1),
     ('BA102','2025-06-06',2,'2025-06-06 07:30','2025-06-06 14:25',1),
     ('BA103','2025-06-07',3,'2025-06-07 09:00','2025-06-07 10:00',1),
@@ -231,10 +405,10 @@ def _generate_data(conn: sqlite3.Connection) -> None:
     ('BA112','2025-06-16',12,'2025-06-16 13:00','2025-06-16 14:30',1),
     ('BA113','2025-06-17',13,'2025-06-17 15:00','2025-06-17 16:50',1),
     ('BA114','2025-06-18',14,'2025-06-18 09:00','2025-06-18 16:40',5),
-    ('BA115','2025-06-19',15,'2025-06-19 07:00','2025-06-19 13:40',3);
+    ('BA115','2025-06-19',15,'2025-06-19 07:00','2025-06-19 13:40',3),
+]
 
-    /* Insert Crew Assignments */
-    INSERT INTO CrewAssignment (flight_id, pilot_id, role) VALUES
+_SEED_CREW = [
     (1, 1, 'Captain'),
     (2, 2, 'Captain'),
     (3, 5, 'Captain'),
@@ -254,7 +428,30 @@ def _generate_data(conn: sqlite3.Connection) -> None:
     (2, 4, 'First Officer'),
     (3, 6, 'First Officer'),
     (4, 8, 'First Officer'),
-    (5, 10, 'First Officer');
-    """
-    
-    conn.executescript(seed_sql)
\ No newline at end of file
+    (5, 10, 'First Officer'),
+]
+
+_SEED = (
+    ("INSERT INTO Airport (airport_code, name, city, country, utc_offset, tz_name) VALUES (?, ?, ?, ?, ?, ?)",
+     _SEED_AIRPORTS),
+    ("INSERT INTO Route (origin_code, dest_code, distance_km, flight_duration_mins) VALUES (?, ?, ?, ?)",
+     _SEED_ROUTES),
+    ("INSERT INTO Pilot (licence_no, first_name, last_name, rank, hire_date) VALUES (?, ?, ?, ?, ?)",
+     _SEED_PILOTS),
+    ("INSERT INTO Flight (flight_number, flight_date, route_id, sched_dep_utc, sched_arr_utc, status) VALUES (?, ?, ?, ?, ?, ?)",
+     _SEED_FLIGHTS),
+    ("INSERT INTO CrewAssignment (flight_id, pilot_id, role) VALUES (?, ?, ?)",
+     _SEED_CREW),
+)
+
+
+def _generate_data(conn: sqlite3.Connection) -> None:
+    # Load everything in one transaction, each INSERT is prepared once and reused per row
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("PRAGMA defer_foreign_keys = ON;") # Check foreign keys once at COMMIT
+    for sql, rows in _SEED:
+        conn.executemany(sql, rows)
+
+    # Populate the materialised view in one pass, the triggers take over after seeding
+    conn.execute("INSERT INTO flight_details_mv SELECT * FROM v_flight_details;")
+    conn.execute("COMMIT")
@@ -2,13 +2,27 @@
 Validation functions and custom exceptions for the Flight Management System
 """
 
-from datetime import datetime
+import re
+from functools import lru_cache
+from datetime import date, datetime
 from config import (
-    VALID_STATUSES, VALID_RANKS, DATE_FORMAT, 
-    DATETIME_FORMAT, AIRPORT_CODE_LENGTH
+    VALID_STATUSES, VALID_RANKS, STATUS_LOOKUP, RANK_LOOKUP, AIRPORT_CODE_LENGTH
 )
 
 
+# Compiled shapes for DATE_FORMAT and DATETIME_FORMAT from the config. fromisoformat
+# accepts other ISO 8601 spellings too, so the exact shape is checked first
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}\Z', re.ASCII)
+_DT_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}\Z', re.ASCII)
+
+# Compiled shapes for identifiers, matched against the stripped input before it is
+# upper-cased. re.ASCII keeps IGNORECASE from folding non-ASCII letters such as 'ſ' into
+# the class, and matching first stops upper() turning e.g. 'ß' into 'SS'
+_AIRPORT_RE = re.compile(rf'[A-Z]{{{AIRPORT_CODE_LENGTH}}}\Z', re.ASCII | re.IGNORECASE)
+_FLIGHT_NUM_RE = re.compile(r'[A-Z0-9]{2,8}\Z', re.ASCII | re.IGNORECASE)
+_LICENCE_RE = re.compile(r'[A-Z0-9-]+\Z', re.ASCII | re.IGNORECASE)
+
+
 class FlightManagementError(Exception):
     pass
 
@@ -23,44 +37,51 @@ class DatabaseError(FlightManagementError):
 
 def validate_date(date_string: str) -> str:
     # Validate that the date string matches the expected format
-    try:
-        datetime.strptime(date_string, DATE_FORMAT)
-        return date_string
-    except ValueError:
-        raise ValidationError(f"Invalid date format: {date_string}. Use YYYY-MM-DD")
+    if _DATE_RE.match(date_string):
+        try:
+            date.fromisoformat(date_string) # Range check, including leap years
+            return date_string
+        except ValueError:
+            pass
+    raise ValidationError(f"Invalid date format: {date_string}. Use YYYY-MM-DD")
 
 
 def validate_datetime(datetime_string: str) -> str:
      # Validate that the datetime string matches the expected format from the config
-    try:
-        datetime.strptime(datetime_string, DATETIME_FORMAT)
-        return datetime_string
-    except ValueError:
-        raise ValidationError(f"Invalid datetime format: {datetime_string}. Use YYYY-MM-DD HH:MM")
+    if _DT_RE.match(datetime_string):
+        try:
+            datetime.fromisoformat(datetime_string) # Range check on date and time fields
+            return datetime_string
+        except ValueError:
+            pass
+    raise ValidationError(f"Invalid datetime format: {datetime_string}. Use YYYY-MM-DD HH:MM")
 
 
+@lru_cache(maxsize=64) # Pure and low-cardinality, repeat inputs skip the work
 def validate_airport_code(code: str) -> str:
     # Validate that the airport code is the correct length and only contains letters
-    code = code.upper().strip()
-    if len(code) != AIRPORT_CODE_LENGTH or not code.isalpha():
+    code = code.strip()
+    if not _AIRPORT_RE.match(code):
         raise ValidationError(f"Airport code must be exactly {AIRPORT_CODE_LENGTH} letters")
-    return code
+    return code.upper()
 
 
+@lru_cache(maxsize=64)
 def validate_flight_status(status: str) -> str:
      # Validate that the flight status is one of the allowed statuses
-    status = status.capitalize()
-    if status not in VALID_STATUSES:
+    valid_status = STATUS_LOOKUP.get(status.strip().lower())
+    if valid_status is None:
         raise ValidationError(f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}")
-    return status
+    return valid_status
 
 
+@lru_cache(maxsize=64)
 def validate_rank(rank: str) -> str:
     # Validate that the rank is one of the allowed ranks
-    rank = rank.title()
-    if rank not in VALID_RANKS:
+    valid_rank = RANK_LOOKUP.get(rank.strip().lower())
+    if valid_rank is None:
         raise ValidationError(f"Rank must be one of: {', '.join(VALID_RANKS)}")
-    return rank
+    return valid_rank
 
 
 def validate_positive_number(value: float, field_name: str) -> float:
@@ -70,16 +91,16 @@ def validate_positive_number(value: float, field_name: str) -> float:
 
 
 def validate_flight_number(flight_number: str) -> str:
-    # Validate that the flight number is not empty
-    flight_number = flight_number.upper().strip()
-    if not flight_number:
-        raise ValidationError("Flight number cannot be empty")
-    return flight_number
+    # Validate that the flight number is 2-8 letters or digits
+    flight_number = flight_number.strip()
+    if not _FLIGHT_NUM_RE.match(flight_number):
+        raise ValidationError("Flight number must be 2-8 letters or digits")
+    return flight_number.upper()
 
 
 def validate_licence_number(licence: str) -> str:
-        # Validate that the licence number is not empty 
-    licence = licence.strip().upper()
-    if not licence:
-        raise ValidationError("Licence number cannot be empty")
-    return licence
\ No newline at end of file
+        # Validate that the licence number is not empty and only contains letters, digits or hyphens
+    licence = licence.strip()
+    if not _LICENCE_RE.match(licence):
+        raise ValidationError("Licence number must only contain letters, digits or hyphens")
+    return licence.upper()
\ No newline at end of file
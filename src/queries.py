@@ -3,8 +3,9 @@ Database queries and operations for operations and modifications
 """
 
 import sqlite3
-from typing import Optional, List
-import pandas as pd
+from functools import lru_cache
+from typing import Optional, List, Iterator, Tuple
+from config import STATUS_IDS
 from database import get_connection
 from models import (
     ValidationError, DatabaseError,
@@ -17,15 +18,98 @@ from utils import (
 )
 
 
+_SQL_GET_FLIGHTS = """
+        SELECT flight_id, flight_number, flight_date,
+               origin_code, dest_code,
+               status_name,
+               sched_dep_utc, sched_arr_utc,
+               captain_name, captain_id,
+               fo_name, fo_id
+        FROM   flight_details_mv
+        {where}
+        ORDER  BY flight_date, sched_dep_utc;
+"""
+
+_SQL_LOAD_FLIGHT = """
+        SELECT flight_id, flight_number, flight_date,
+               sched_dep_utc, sched_arr_utc,
+               status_name, origin_code, dest_code,
+               captain_name, captain_id, fo_name, fo_id
+        FROM flight_details_mv
+        WHERE flight_number = ? AND flight_date = ?
+"""
+
+# Index-only seek: the UNIQUE (flight_number, flight_date) index carries the rowid
+_SQL_LOOKUP_FLIGHT_ID = "SELECT flight_id FROM Flight WHERE flight_number=? AND flight_date=?"
+
+# Creates the route with placeholder distance/duration, returning a row only if it was new
+_SQL_CREATE_ROUTE = """
+        INSERT INTO Route (origin_code, dest_code, distance_km, flight_duration_mins)
+        VALUES (?, ?, 0, 0)
+        ON CONFLICT (origin_code, dest_code) DO NOTHING
+        RETURNING route_id
+"""
+
+_SQL_FIND_ROUTE = "SELECT route_id FROM Route WHERE origin_code=? AND dest_code=?"
+
+_SQL_UPDATE_ROUTE = "UPDATE Flight SET route_id=? WHERE flight_id=?"
+
+_SQL_UPDATE_TIMES = """
+        UPDATE Flight
+        SET sched_dep_utc=?, sched_arr_utc=?
+        WHERE flight_id=?
+"""
+
+_SQL_UPDATE_STATUS = "UPDATE Flight SET status=? WHERE flight_id=?"
+
+_SQL_FIND_PILOT = "SELECT first_name, last_name, rank FROM Pilot WHERE pilot_id=?"
+
+# Crew changes replace the pilot in place via the UNIQUE (flight_id, role) index
+_SQL_UPSERT_CREW_CAP = """
+        INSERT INTO CrewAssignment (flight_id, pilot_id, role)
+        VALUES (?, ?, 'Captain')
+        ON CONFLICT (flight_id, role) DO UPDATE SET pilot_id = excluded.pilot_id
+"""
+
+_SQL_UPSERT_CREW_FO = """
+        INSERT INTO CrewAssignment (flight_id, pilot_id, role)
+        VALUES (?, ?, 'First Officer')
+        ON CONFLICT (flight_id, role) DO UPDATE SET pilot_id = excluded.pilot_id
+"""
+
+# Variants used when no preview is shown: the flight is matched by number and date
+# inside the statement itself, RETURNING tells us whether it exists
+_SQL_UPDATE_ROUTE_BY_NUMBER = """
+        UPDATE Flight SET route_id=?
+        WHERE flight_number=? AND flight_date=?
+        RETURNING flight_id
+"""
+
+_SQL_UPDATE_TIMES_BY_NUMBER = """
+        UPDATE Flight
+        SET sched_dep_utc=?, sched_arr_utc=?
+        WHERE flight_number=? AND flight_date=?
+        RETURNING flight_id
+"""
+
+_SQL_UPDATE_STATUS_BY_NUMBER = """
+        UPDATE Flight SET status=?
+        WHERE flight_number=? AND flight_date=?
+        RETURNING flight_id
+"""
+
+
 def get_flights(origin_code: Optional[str] = None,  dest_code: Optional[str] = None,
                 status_name: Optional[str] = None,
                 date_from: Optional[str] = None,
                 date_to: Optional[str] = None,
-                captain_id: Optional[int] = None):
+                captain_id: Optional[int] = None,
+                chunksize: Optional[int] = None):
     
     """
     Retrieve flights based on optional filter criteria like origin, destination, date range, status, and captain ID
-    Returns a list of matching flight records
+    Returns (headers, rows) where rows is a list of plain tuples in header order, or if chunksize
+    is given, a generator yielding lists of at most chunksize rows so large results are never held at once
     """
 
     try:
@@ -42,72 +126,103 @@ def get_flights(origin_code: Optional[str] = None,  dest_code: Optional[str] = N
             date_to = validate_date(date_to)
 
 
-        # SQL query with optional filters (utilising NULL-safe filtering)
-        query = """
-
-        SELECT flight_id, flight_number, flight_date,
-               origin_code, dest_code,
-               status_name,
-               sched_dep_utc, sched_arr_utc,
-               captain_name, captain_id,
-               fo_name, fo_id
-        FROM   v_flight_details
-        WHERE  (:origin IS NULL OR origin_code = :origin)
-           AND (:dest   IS NULL OR dest_code   = :dest)
-           AND (:stat   IS NULL OR status_name = :stat)
-           AND (:dfrom  IS NULL OR flight_date >= :dfrom)
-           AND (:dto    IS NULL OR flight_date <= :dto)
-           AND (:cap    IS NULL OR captain_id  = :cap)
-        ORDER  BY flight_date, sched_dep_utc;
-        """
-        
-        params = {
-            "origin": origin_code,
-            "dest": dest_code,
-            "stat": status_name,
-            "dfrom": date_from,
-            "dto": date_to,
-            "cap": captain_id,
-        }
+        # Only the filters that were supplied go into the WHERE clause
+        filters = (
+            ("origin_code = ?", origin_code),
+            ("dest_code = ?", dest_code),
+            ("status_name = ?", status_name),
+            ("flight_date >= ?", date_from),
+            ("flight_date <= ?", date_to),
+            ("captain_id = ?", captain_id),
+        )
+        conditions = tuple(cond for cond, value in filters if value is not None)
+        params = [value for _, value in filters if value is not None]
         
         with get_connection() as conn:
             cur = conn.cursor()
-            cur.execute(query, params)
-            return cur.fetchall()
+            cur.row_factory = None # Plain tuples, the display side indexes columns by position
+            cur.execute(_get_flights_sql(conditions), params)
+            headers = [d[0] for d in cur.description]
+            if chunksize:
+                return headers, _iter_chunks(cur, chunksize)
+            return headers, cur.fetchall()
             
     except ValidationError as e:
         print(str(e))
-        return []
+        return [], []
     except DatabaseError as e:
         print(str(e))
-        return []
+        return [], []
+
+
+@lru_cache(maxsize=64)
+def _get_flights_sql(conditions: Tuple[str, ...]) -> str:
+    """
+    Build the get_flights query for one combination of filters
+    Cached so each filter combination always maps to the same SQL string
+    """
 
+    where = "WHERE  " + "\n           AND ".join(conditions) if conditions else ""
+    return _SQL_GET_FLIGHTS.format(where=where)
 
-def _load_flight(flight_number: str, flight_date: str, conn: sqlite3.Connection) -> dict:
+
+def _iter_chunks(cur: sqlite3.Cursor, chunksize: int) -> Iterator[List[tuple]]:
     """
-    Load a specific flight from the database given its flight number and date
+    Yield the remaining rows of a cursor in lists of at most chunksize rows
+    """
+
+    try:
+        while True:
+            rows = cur.fetchmany(chunksize)
+            if not rows:
+                return
+            yield rows
+    except sqlite3.Error as e:
+        raise DatabaseError(f"Database Error: {e}")
+
+
+def _lookup_flight_id(flight_number: str, flight_date: str, conn: sqlite3.Connection) -> int:
+    """
+    Find the flight_id for a flight number and date, without loading any details
+    """
+
+    flight_number = validate_flight_number(flight_number)
+    row = conn.execute(_SQL_LOOKUP_FLIGHT_ID, (flight_number, flight_date)).fetchone()
+    if not row:
+        raise ValidationError(f"No flight found for {flight_number} on {flight_date}")
+    return row[0]
+
+
+def _load_flight_preview(flight_number: str, flight_date: str, conn: sqlite3.Connection) -> dict:
+    """
+    Load a specific flight with all its display details, for previewing a change
     """
 
     flight_number = validate_flight_number(flight_number)
     cur = conn.cursor()
-    cur.execute("""
-        SELECT flight_id, flight_number, flight_date,
-               sched_dep_utc, sched_arr_utc,
-               status_name, origin_code, dest_code,
-               captain_name, captain_id, fo_name, fo_id
-        FROM v_flight_details
-        WHERE flight_number = ? AND flight_date = ?
-    """, (flight_number, flight_date))
+    cur.execute(_SQL_LOAD_FLIGHT, (flight_number, flight_date))
     row = cur.fetchone()
     if not row:
         raise ValidationError(f"No flight found for {flight_number} on {flight_date}")
     return dict(row)
 
 
-def change_route(flight_number: str, flight_date: str, new_origin: str, new_dest: str) -> None:
+def _require_flight(row, flight_number: str, flight_date: str) -> None:
+    """
+    Raise if an UPDATE did not match any flight
+    row is the RETURNING row, or the cursor's rowcount for an update by flight_id
+    """
+
+    if not row:
+        raise ValidationError(f"No flight found for {flight_number} on {flight_date}")
+
+
+def change_route(flight_number: str, flight_date: str, new_origin: str, new_dest: str,
+                 confirm: bool = True) -> None:
     """
     Change the route for a flight
     creates a new route if it doesn't already exist
+    Pass confirm=False to skip the preview and confirmation prompt
     """
 
     try:
@@ -117,51 +232,54 @@ def change_route(flight_number: str, flight_date: str, new_origin: str, new_dest
         flight_date = validate_date(flight_date)
         
         with get_connection() as conn:
-            conn.execute("BEGIN")  # Start transaction
-            flight = _load_flight(flight_number, flight_date, conn) # Load current flight details
-            
-             # Prepare proposed changes for user preview
-            proposed = flight.copy()
-            proposed["origin_code"] = new_origin
-            proposed["dest_code"] = new_dest
-            
-            format_preview(flight, proposed)  # Show old vs new details
-
-            if not confirm_action():
-                conn.rollback()
-                print("Route change cancelled ")
-                return
             cur = conn.cursor()
-            # Check if the new route exists
-            route_id = cur.execute(
-                "SELECT route_id FROM Route WHERE origin_code=? AND dest_code=?",
-                (new_origin, new_dest)
-            ).fetchone()
-            
-            if route_id:
-                route_id = route_id[0] # the existing route
+            if confirm:
+                # Preview and confirm before taking the write lock
+                flight = _load_flight_preview(flight_number, flight_date, conn) # Load current flight details
+                
+                 # Prepare proposed changes for user preview
+                proposed = flight.copy()
+                proposed["origin_code"] = new_origin
+                proposed["dest_code"] = new_dest
+                
+                format_preview(flight, proposed)  # Show old vs new details
+
+                if not confirm_action():
+                    print("Route change cancelled ")
+                    return
+
+            conn.execute("BEGIN IMMEDIATE")  # Start transaction
+            # Create the route if it doesn't exist yet, otherwise look up the existing one
+            created = cur.execute(_SQL_CREATE_ROUTE, (new_origin, new_dest)).fetchone()
+            if created:
+                route_id = created[0]
             else:
-                # Create new route with placeholders for distance/duration
-                cur.execute("""
-                    INSERT INTO Route (origin_code, dest_code, distance_km, flight_duration_mins)
-                    VALUES (?, ?, 0, 0)
-                """, (new_origin, new_dest))
-                route_id = cur.lastrowid
-                print(f"Created new route {new_origin} -> {new_dest}")
+                route_id = cur.execute(_SQL_FIND_ROUTE, (new_origin, new_dest)).fetchone()[0]
             
             # Update the flight with the new route_id
-            cur.execute("UPDATE Flight SET route_id=? WHERE flight_id=?",
-                       (route_id, flight["flight_id"]))
-            conn.commit()
+            if confirm:
+                cur.execute(_SQL_UPDATE_ROUTE, (route_id, flight["flight_id"]))
+                # The flight may have been removed since the preview was read
+                _require_flight(cur.rowcount, flight["flight_number"], flight_date)
+            else:
+                flight_number = validate_flight_number(flight_number)
+                row = cur.execute(_SQL_UPDATE_ROUTE_BY_NUMBER,
+                                  (route_id, flight_number, flight_date)).fetchone()
+                _require_flight(row, flight_number, flight_date)
+            conn.execute("COMMIT")
+            if created:
+                print(f"Created new route {new_origin} -> {new_dest}")
             print("Route updated successfully")
             
     except (ValidationError, DatabaseError) as e:
         print(str(e))
 
 
-def change_times(flight_number: str, flight_date: str, new_dep: str, new_arr: str) -> None:
+def change_times(flight_number: str, flight_date: str, new_dep: str, new_arr: str,
+                 confirm: bool = True) -> None:
     """
     Change the scheduled departure and arrival times for a flight
+    Pass confirm=False to skip the preview and confirmation prompt
     """
 
     try:
@@ -174,37 +292,43 @@ def change_times(flight_number: str, flight_date: str, new_dep: str, new_arr: st
             raise ValidationError("Departure time must be before arrival time")
         
         with get_connection() as conn:
-            conn.execute("BEGIN")
-            flight = _load_flight(flight_number, flight_date, conn)
-            
-            # Copy existing schedule and update df, without impacting Database
-            proposed = flight.copy()
-            proposed["sched_dep_utc"] = new_dep
-            proposed["sched_arr_utc"] = new_arr
-            
-            format_preview(flight, proposed)
-            if not confirm_action():
-                conn.rollback()
-                print("Time change cancelled.")
-                return
-            
             cur = conn.cursor()
-            # Update the flight times in database
-            cur.execute("""
-                UPDATE Flight
-                SET sched_dep_utc=?, sched_arr_utc=?
-                WHERE flight_id=?
-            """, (new_dep, new_arr, flight["flight_id"]))
-            conn.commit()
+            if confirm:
+                # Preview and confirm before taking the write lock
+                flight = _load_flight_preview(flight_number, flight_date, conn)
+                
+                # Copy existing schedule and update df, without impacting Database
+                proposed = flight.copy()
+                proposed["sched_dep_utc"] = new_dep
+                proposed["sched_arr_utc"] = new_arr
+                
+                format_preview(flight, proposed)
+                if not confirm_action():
+                    print("Time change cancelled.")
+                    return
+                
+                # Update the flight times in database
+                conn.execute("BEGIN IMMEDIATE")
+                cur.execute(_SQL_UPDATE_TIMES, (new_dep, new_arr, flight["flight_id"]))
+                _require_flight(cur.rowcount, flight["flight_number"], flight_date)
+            else:
+                flight_number = validate_flight_number(flight_number)
+                conn.execute("BEGIN IMMEDIATE")
+                row = cur.execute(_SQL_UPDATE_TIMES_BY_NUMBER,
+                                  (new_dep, new_arr, flight_number, flight_date)).fetchone()
+                _require_flight(row, flight_number, flight_date)
+            conn.execute("COMMIT")
             print("Times updated successfully")
             
     except (ValidationError, DatabaseError) as e:
         print(str(e))
 
 
-def change_status(flight_number: str, flight_date: str, new_status: str) -> None:
+def change_status(flight_number: str, flight_date: str, new_status: str,
+                  confirm: bool = True) -> None:
     """
     Change the flight status for a flight
+    Pass confirm=False to skip the preview and confirmation prompt
     """
 
     try:
@@ -212,41 +336,42 @@ def change_status(flight_number: str, flight_date: str, new_status: str) -> None
         flight_date = validate_date(flight_date)
         
         with get_connection() as conn:
+            sid = STATUS_IDS[new_status] # Status code stored on the flight
+
             cur = conn.cursor()
-            # Get the status_id for the new status
-            sid = cur.execute(
-                "SELECT status_id FROM FlightStatus WHERE status_name=?",
-                (new_status,)
-            ).fetchone()
-            
-            if not sid:
-                raise ValidationError(f"Invalid status: {new_status}")
-            sid = sid[0]
-            
-            conn.execute("BEGIN")  # Start transaction
-            flight = _load_flight(flight_number, flight_date, conn)
-            
-            proposed = flight.copy()
-            proposed["status_name"] = new_status
-            
-            format_preview(flight, proposed) # Show status change
-            if not confirm_action():
-                conn.rollback()
-                print("Status change cancelled.")
-                return
-            # Update the flight's status_id 
-            cur.execute("UPDATE Flight SET status_id=? WHERE flight_id=?",
-                       (sid, flight["flight_id"]))
-            conn.commit()
+            if confirm:
+                # Preview and confirm before taking the write lock
+                flight = _load_flight_preview(flight_number, flight_date, conn)
+                
+                proposed = flight.copy()
+                proposed["status_name"] = new_status
+                
+                format_preview(flight, proposed) # Show status change
+                if not confirm_action():
+                    print("Status change cancelled.")
+                    return
+                # Update the flight's status 
+                conn.execute("BEGIN IMMEDIATE")  # Start transaction
+                cur.execute(_SQL_UPDATE_STATUS, (sid, flight["flight_id"]))
+                _require_flight(cur.rowcount, flight["flight_number"], flight_date)
+            else:
+                flight_number = validate_flight_number(flight_number)
+                conn.execute("BEGIN IMMEDIATE")  # Start transaction
+                row = cur.execute(_SQL_UPDATE_STATUS_BY_NUMBER,
+                                  (sid, flight_number, flight_date)).fetchone()
+                _require_flight(row, flight_number, flight_date)
+            conn.execute("COMMIT")
             print("Status updated successfully")
             
     except (ValidationError, DatabaseError) as e:
         print(str(e))
 
 
-def change_captain(flight_number: str, flight_date: str, new_pilot_id: int) -> None:
+def change_captain(flight_number: str, flight_date: str, new_pilot_id: int,
+                   confirm: bool = True) -> None:
     """
     Reassign a captain to a flight
+    Pass confirm=False to skip the preview and confirmation prompt
     """
 
     try:
@@ -255,10 +380,7 @@ def change_captain(flight_number: str, flight_date: str, new_pilot_id: int) -> N
         with get_connection() as conn:
             cur = conn.cursor()
             # Verify the pilot exists and is a captain
-            pilot = cur.execute(
-                "SELECT first_name, last_name, rank FROM Pilot WHERE pilot_id=?",
-                (new_pilot_id,)
-            ).fetchone()
+            pilot = cur.execute(_SQL_FIND_PILOT, (new_pilot_id,)).fetchone()
             
             if not pilot:
                 raise ValidationError(f"Pilot with ID {new_pilot_id} not found")
@@ -266,39 +388,35 @@ def change_captain(flight_number: str, flight_date: str, new_pilot_id: int) -> N
             if pilot[2] != 'Captain':
                 raise ValidationError(f"{pilot[0]} {pilot[1]} is not a Captain")
             
-            conn.execute("BEGIN") # Start transaction
-            flight = _load_flight(flight_number, flight_date, conn)
-            
-            proposed = flight.copy()
-            proposed["captain_name"] = f"{pilot[0]} {pilot[1]}"
-            proposed["captain_id"] = new_pilot_id
-            
-            format_preview(flight, proposed) # Preview captain change
-            if not confirm_action():
-                conn.rollback()
-                print("Captain change cancelled.")
-                return
-            
-             # Remove existing captain
-            cur.execute("DELETE FROM CrewAssignment WHERE flight_id=? AND role='Captain'",
-                       (flight["flight_id"],))
-            
-            # And assign new captain
-            cur.execute("""
-                INSERT INTO CrewAssignment (flight_id, pilot_id, role)
-                VALUES (?, ?, 'Captain')
-            """, (flight["flight_id"], new_pilot_id))
+            if confirm:
+                # Preview and confirm before taking the write lock
+                flight = _load_flight_preview(flight_number, flight_date, conn)
+                
+                proposed = flight.copy()
+                proposed["captain_name"] = f"{pilot[0]} {pilot[1]}"
+                proposed["captain_id"] = new_pilot_id
+                
+                format_preview(flight, proposed) # Preview captain change
+                if not confirm_action():
+                    print("Captain change cancelled.")
+                    return
+                flight_id = flight["flight_id"]
+            else:
+                flight_id = _lookup_flight_id(flight_number, flight_date, conn)
             
-            conn.commit()
+            # Assign new captain, replacing the existing one in a single statement
+            cur.execute(_SQL_UPSERT_CREW_CAP, (flight_id, new_pilot_id))
             print("Captain reassigned successfully")
             
     except (ValidationError, DatabaseError) as e:
         print(str(e))
 
 
-def change_first_officer(flight_number: str, flight_date: str, new_pilot_id: int) -> None:
+def change_first_officer(flight_number: str, flight_date: str, new_pilot_id: int,
+                         confirm: bool = True) -> None:
     """
     Reassign a new first officer to a flight
+    Pass confirm=False to skip the preview and confirmation prompt
     """
 
     try:
@@ -308,9 +426,7 @@ def change_first_officer(flight_number: str, flight_date: str, new_pilot_id: int
             cur = conn.cursor()
 
             # Verify the pilot exists and is a first officer
-            pilot = cur.execute(
-                "SELECT first_name, last_name, rank FROM Pilot WHERE pilot_id=?",
-                (new_pilot_id,)).fetchone()
+            pilot = cur.execute(_SQL_FIND_PILOT, (new_pilot_id,)).fetchone()
             
             if not pilot:
                 raise ValidationError(f"Pilot with ID {new_pilot_id} not found")
@@ -318,30 +434,24 @@ def change_first_officer(flight_number: str, flight_date: str, new_pilot_id: int
             if pilot[2] != 'First Officer':
                 raise ValidationError(f"{pilot[0]} {pilot[1]} is not a First Officer")
             
-            conn.execute("BEGIN")
-            flight = _load_flight(flight_number, flight_date, conn)
-            
-            proposed = flight.copy()
-            proposed["fo_name"] = f"{pilot[0]} {pilot[1]}"
-            proposed["fo_id"] = new_pilot_id
-            
-            format_preview(flight, proposed)
-            if not confirm_action():
-                conn.rollback()
-                print("First Officer change cancelled")
-                return
-            
-            # Remove existing first officer
-            cur.execute("DELETE FROM CrewAssignment WHERE flight_id=? AND role='First Officer'",
-                       (flight["flight_id"],))
-            
-            # Assign new first officer
-            cur.execute("""
-                INSERT INTO CrewAssignment (flight_id, pilot_id, role)
-                VALUES (?, ?, 'First Officer')
-            """, (flight["flight_id"], new_pilot_id))
+            if confirm:
+                # Preview and confirm before taking the write lock
+                flight = _load_flight_preview(flight_number, flight_date, conn)
+                
+                proposed = flight.copy()
+                proposed["fo_name"] = f"{pilot[0]} {pilot[1]}"
+                proposed["fo_id"] = new_pilot_id
+                
+                format_preview(flight, proposed)
+                if not confirm_action():
+                    print("First Officer change cancelled")
+                    return
+                flight_id = flight["flight_id"]
+            else:
+                flight_id = _lookup_flight_id(flight_number, flight_date, conn)
             
-            conn.commit()
+            # Assign new first officer, replacing the existing one in a single statement
+            cur.execute(_SQL_UPSERT_CREW_FO, (flight_id, new_pilot_id))
             print("First Officer changed successfully")
             
     except (ValidationError, DatabaseError) as e:
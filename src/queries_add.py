@@ -1,7 +1,8 @@
 import sqlite3
-from typing import Optional
-import pandas as pd
-from database import get_connection
+import sys
+from typing import Optional, Iterable, Tuple, List, Callable
+from config import STATUS_IDS
+from database import get_connection, transaction
 from models import (
     ValidationError, DatabaseError,
     validate_date, validate_datetime, validate_airport_code, validate_flight_status, validate_rank, validate_positive_number,
@@ -10,6 +11,47 @@ from models import (
 from utils import format_summary_table
 
 
+_SQL_INS_AIRPORT = """
+        INSERT INTO Airport (airport_code, name, city, country, utc_offset, tz_name)
+        VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_AIRPORTS_FOUND = "SELECT airport_code FROM Airport WHERE airport_code IN (?, ?)"
+
+_SQL_INS_ROUTE = """
+        INSERT INTO Route (origin_code, dest_code, distance_km, flight_duration_mins)
+        VALUES (?, ?, ?, ?)
+"""
+
+_SQL_INS_PILOT = """
+        INSERT INTO Pilot (licence_no, first_name, last_name, rank, hire_date)
+        VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_FIND_ROUTE_CODES = "SELECT origin_code, dest_code FROM Route WHERE route_id=?"
+
+_SQL_INS_FLIGHT = """
+        INSERT INTO Flight (flight_number, flight_date, route_id,
+                            sched_dep_utc, sched_arr_utc, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Flight and pilot in one statement; the LEFT JOINs leave NULLs for whichever ID is unknown
+_SQL_FIND_FLIGHT_PILOT = """
+        SELECT f.flight_number, f.flight_date, p.first_name, p.last_name, p.rank
+        FROM (SELECT ? AS flight_id, ? AS pilot_id) k
+        LEFT JOIN Flight f ON f.flight_id = k.flight_id
+        LEFT JOIN Pilot p ON p.pilot_id = k.pilot_id
+"""
+
+# Replaces the current captain in place via the UNIQUE (flight_id, role) index
+_SQL_UPSERT_CREW_CAP = """
+        INSERT INTO CrewAssignment (flight_id, pilot_id, role)
+        VALUES (?, ?, 'Captain')
+        ON CONFLICT (flight_id, role) DO UPDATE SET pilot_id = excluded.pilot_id
+"""
+
+
 def add_airport(code: str, name: str, city: str, country: str,
                 utc_offset: float, tz_name: str) -> None:
     """
@@ -19,13 +61,10 @@ def add_airport(code: str, name: str, city: str, country: str,
     try:
         code = validate_airport_code(code)  # Ensure airport code is valid
         
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with transaction() as conn:
             # Insert new airport details
-            cur.execute("""
-                INSERT INTO Airport (airport_code, name, city, country, utc_offset, tz_name) VALUES (?, ?, ?, ?, ?, ?)""", (code, name, city, country, utc_offset, tz_name))
-            conn.commit()
-            print(f"Airport  {code} - {name}  added successfully")
+            conn.execute(_SQL_INS_AIRPORT, (code, name, city, country, utc_offset, tz_name))
+        print(f"Airport  {code} - {name}  added successfully")
             
     except ValidationError as e: # Input validation error
         print(str(e))
@@ -50,20 +89,19 @@ def add_route(origin: str, dest: str, distance_km: float, flight_duration_mins:
         if origin == dest:
             raise ValidationError("Origin and destination must be different")
         
-        with get_connection() as conn:
+        # Check and insert under one write lock so the airports can't vanish in between
+        with transaction() as conn:
             cur = conn.cursor()
             
-
-            # Verify that the airports exist
-            for code in (origin, dest):
-                if not cur.execute("SELECT 1 FROM Airport WHERE airport_code=?", (code,)).fetchone():
-                    raise ValidationError(f"Airport {code} not found")
+            # Verify that both airports exist with a single lookup
+            found = {row[0] for row in cur.execute(_SQL_AIRPORTS_FOUND, (origin, dest))}
+            missing = [code for code in (origin, dest) if code not in found]
+            if missing:
+                raise ValidationError(f"Airport {' and '.join(missing)} not found")
             
             # Now insert the new route
-            cur.execute("""
-                INSERT INTO Route (origin_code, dest_code, distance_km, flight_duration_mins) VALUES (?, ?, ?, ?)""", (origin, dest, distance_km, flight_duration_mins))
-            conn.commit()
-            print(f"Route {origin} -> {dest} added successfully")
+            cur.execute(_SQL_INS_ROUTE, (origin, dest, distance_km, flight_duration_mins))
+        print(f"Route {origin} -> {dest} added successfully")
             
 
     except ValidationError as e:
@@ -86,14 +124,10 @@ def add_pilot(licence: str, first_name: str, last_name: str,
         hire_date = validate_date(hire_date)
         licence = validate_licence_number(licence)
         
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with transaction() as conn:
             # Insert new pilot details
-            cur.execute("""INSERT INTO Pilot (licence_no, first_name, last_name, rank, hire_date)
-                VALUES (?, ?, ?, ?, ?)
-            """, (licence, first_name, last_name, rank, hire_date))
-            conn.commit()
-            print(f"{rank} {first_name} {last_name} added successfully. Happy flying")
+            conn.execute(_SQL_INS_PILOT, (licence, first_name, last_name, rank, hire_date))
+        print(f"{rank} {first_name} {last_name} added successfully. Happy flying")
             
     except ValidationError as e:
         print(str(e))
@@ -120,32 +154,20 @@ def add_flight(flight_number: str, flight_date: str, route_id: int,
         if sched_dep_utc >= sched_arr_utc:
             raise ValidationError("Departure time must be before arrival time!")
         
-        with get_connection() as conn:
+        with transaction() as conn:
             cur = conn.cursor()
             
             # Verify route exists
-            route = cur.execute(
-                "SELECT origin_code, dest_code FROM Route WHERE route_id=?",
-                (route_id,)
-            ).fetchone()
+            route = cur.execute(_SQL_FIND_ROUTE_CODES, (route_id,)).fetchone()
             
             if not route:
                 raise ValidationError(f"Route ID {route_id} not found")
             
-            # Get status ID
-            sid = cur.execute(
-                "SELECT status_id FROM FlightStatus WHERE status_name=?",
-                (status,)
-            ).fetchone()[0]
+            sid = STATUS_IDS[status]
             
-            cur.execute("""
-                INSERT INTO Flight (flight_number, flight_date, route_id,
-                                  sched_dep_utc, sched_arr_utc, status_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (flight_number, flight_date, route_id, sched_dep_utc, sched_arr_utc, sid))
+            cur.execute(_SQL_INS_FLIGHT, (flight_number, flight_date, route_id, sched_dep_utc, sched_arr_utc, sid))
             
-            conn.commit()
-            print(f"Flight {flight_number} on {flight_date} ({route[0]} -> {route[1]}) added successfully")
+        print(f"Flight {flight_number} on {flight_date} ({route[0]} -> {route[1]}) added successfully")
             
     except ValidationError as e:
         print(str(e))
@@ -161,44 +183,27 @@ def assign_captain(flight_id: int, pilot_id: int) -> None:
     If a captain is already assigned, replace them
     """
     try:
-        with get_connection() as conn:
+        with transaction() as conn:
             cur = conn.cursor()
             
-            # Verify flight exists
-            flight = cur.execute(
-                "SELECT flight_number, flight_date FROM Flight WHERE flight_id=?",
-                (flight_id,)
+            # Verify flight exists and pilot exists and is a captain
+            number, date, first, last, rank = cur.execute(
+                _SQL_FIND_FLIGHT_PILOT, (flight_id, pilot_id)
             ).fetchone()
             
-            if not flight:
+            if number is None:
                 raise ValidationError(f"Flight ID {flight_id} not found")
             
-            # Verify pilot exists and is a captain
-            pilot = cur.execute(
-                "SELECT first_name, last_name, rank FROM Pilot WHERE pilot_id=?",
-                (pilot_id,)
-            ).fetchone()
-            
-            if not pilot:
+            if rank is None:
                 raise ValidationError(f"Pilot ID {pilot_id} not found")
             
-            if pilot[2] != 'Captain':
-                raise ValidationError(f"{pilot[0]} {pilot[1]} is not a Captain")
+            if rank != 'Captain':
+                raise ValidationError(f"{first} {last} is not a Captain")
             
-            # Remove existing captain if any
-            cur.execute(
-                "DELETE FROM CrewAssignment WHERE flight_id=? AND role='Captain'",
-                (flight_id,)
-            )
+            # Assign new captain, replacing any existing one
+            cur.execute(_SQL_UPSERT_CREW_CAP, (flight_id, pilot_id))
             
-            # Assign new captain
-            cur.execute("""
-                INSERT INTO CrewAssignment (flight_id, pilot_id, role)
-                VALUES (?, ?, 'Captain')
-            """, (flight_id, pilot_id))
-            
-            conn.commit()
-            print(f"Captain {pilot[0]} {pilot[1]} assigned to flight {flight[0]} on {flight[1]}")
+        print(f"Captain {first} {last} assigned to flight {number} on {date}")
             
     except ValidationError as e:
         print(str(e))
@@ -208,6 +213,102 @@ def assign_captain(flight_id: int, pilot_id: int) -> None:
         print(str(e))
 
 
+# Bulk loaders, for importing many rows at once (e.g. from a CSV file)
+def _validate_rows(rows: Iterable, width: int, validate: Callable[..., tuple]) -> List[tuple]:
+    """
+    Validate every bulk row before any of them is inserted
+    Each row must have exactly width values and is passed to validate, which returns the row to insert.
+    A short, long or malformed row is raised as a ValidationError naming its 1-based row number
+    """
+
+    checked = []
+    for n, row in enumerate(rows, start=1):
+        try:
+            if len(row) != width:
+                raise ValidationError(f"expected {width} values, got {len(row)}")
+            checked.append(validate(*row))
+        except (ValidationError, TypeError, ValueError, AttributeError) as e:
+            raise ValidationError(f"Row {n}: {e}") from e
+    return checked
+
+
+def _airport_row(code, name, city, country, utc_offset, tz_name) -> tuple:
+    return validate_airport_code(code), name, city, country, float(utc_offset), tz_name
+
+
+def _route_row(origin, dest, distance_km, flight_duration_mins) -> tuple:
+    origin = validate_airport_code(origin)
+    dest = validate_airport_code(dest)
+    if origin == dest:
+        raise ValidationError("Origin and destination must be different")
+    return (origin, dest,
+            validate_positive_number(float(distance_km), "Distance"),
+            int(validate_positive_number(int(flight_duration_mins), "Flight duration")))
+
+
+def _pilot_row(licence, first_name, last_name, rank, hire_date) -> tuple:
+    return validate_licence_number(licence), first_name, last_name, validate_rank(rank), validate_date(hire_date)
+
+
+def add_airports_bulk(rows: Iterable[Tuple[str, str, str, str, float, str]]) -> None:
+    """
+    Add many airports in one transaction
+    Each row is (code, name, city, country, utc_offset, tz_name); if any row is rejected nothing is added
+    """
+
+    try:
+        # Validate every row before taking the write lock
+        rows = _validate_rows(rows, 6, _airport_row)
+        
+        with transaction() as conn:
+            conn.executemany(_SQL_INS_AIRPORT, rows)
+        print(f"{len(rows)} airports added successfully")
+        
+    except ValidationError as e:
+        print(str(e))
+    except DatabaseError as e:
+        print(str(e))
+
+
+def add_routes_bulk(rows: Iterable[Tuple[str, str, float, int]]) -> None:
+    """
+    Add many routes in one transaction
+    Each row is (origin, dest, distance_km, flight_duration_mins); if any row is rejected nothing is added
+    """
+
+    try:
+        rows = _validate_rows(rows, 4, _route_row)
+        
+        # Unknown airports are rejected by the Route foreign keys
+        with transaction() as conn:
+            conn.executemany(_SQL_INS_ROUTE, rows)
+        print(f"{len(rows)} routes added successfully")
+        
+    except ValidationError as e:
+        print(str(e))
+    except DatabaseError as e:
+        print(str(e))
+
+
+def add_pilots_bulk(rows: Iterable[Tuple[str, str, str, str, str]]) -> None:
+    """
+    Add many pilots in one transaction
+    Each row is (licence, first_name, last_name, rank, hire_date); if any row is rejected nothing is added
+    """
+
+    try:
+        rows = _validate_rows(rows, 5, _pilot_row)
+        
+        with transaction() as conn:
+            conn.executemany(_SQL_INS_PILOT, rows)
+        print(f"{len(rows)} pilots added successfully")
+        
+    except ValidationError as e:
+        print(str(e))
+    except DatabaseError as e:
+        print(str(e))
+
+
 # Summary queries
 def run_summary_query(query: str, params: Optional[dict] = None, title: str = "Results") -> None:
     """
@@ -221,8 +322,10 @@ def run_summary_query(query: str, params: Optional[dict] = None, title: str = "R
 
     try:
         with get_connection() as conn:
-            df = pd.read_sql_query(query, conn, params=params or {})
-            format_summary_table(df, title)
+            cur = conn.execute(query, params or {})
+            rows = cur.fetchall()
+            headers = [d[0] for d in cur.description]
+        format_summary_table(headers, rows, title)
     except Exception as e:
         print(f"Query failed unexpectdly: {e}")
 
@@ -233,7 +336,7 @@ def flights_per_destination():
     SELECT 
         dest_code AS "Destination", 
         COUNT(*) AS "Total Flights"
-    FROM v_flight_details
+    FROM flight_details_mv
     GROUP BY dest_code
     ORDER BY COUNT(*) DESC;
     """
@@ -250,7 +353,7 @@ def flights_per_destination_date_range(date_from: str, date_to: str):
         SELECT 
             dest_code AS "Destination", 
             COUNT(*) AS "Flights"
-        FROM v_flight_details
+        FROM flight_details_mv
         WHERE flight_date BETWEEN :from AND :to
         GROUP BY dest_code
         ORDER BY COUNT(*) DESC;
@@ -286,7 +389,7 @@ def flights_by_status():
     SELECT 
         status_name AS "Status", 
         COUNT(*) AS "Number of Flights"
-    FROM v_flight_details
+    FROM flight_details_mv
     GROUP BY status_name
     ORDER BY COUNT(*) DESC;
     """
@@ -299,7 +402,7 @@ def top_busiest_routes(limit: int = 10):
     SELECT 
         origin_code || ' -> ' || dest_code AS "Route",
         COUNT(*) AS "Number of Flights"
-    FROM v_flight_details
+    FROM flight_details_mv
     GROUP BY origin_code, dest_code
     ORDER BY COUNT(*) DESC
     LIMIT :limit;
@@ -366,8 +469,10 @@ def show_pilots_by_rank(rank: str):
         with get_connection() as conn:
             cur = conn.cursor()
             cur.execute(query, (rank,))
-            pilots = cur.fetchall()
-            for pilot in pilots:
-                print(f"  ID: {pilot[0]:3d} - {pilot[1]}")
+            # Build the listing in batches and write it in one go rather than one print per pilot
+            lines = []
+            while pilots := cur.fetchmany(256):
+                lines.extend(f"  ID: {pid:3d} - {name}\n" for pid, name in pilots)
+            sys.stdout.write("".join(lines))
     except Exception as e:
         print(f"Failed to load pilots unexpectedly: {e}")
\ No newline at end of file
@@ -2,10 +2,12 @@
 CLI User interface for the Flight Management System
 """
 
+import sys
+from itertools import chain
 from database import initialise_tables
 from config import MENU_WIDTH
 from utils import (
-    print_section_header, safe_input, format_flight_table
+    section_header, safe_input, format_flight_table
 )
 
 from queries import (
@@ -21,10 +23,59 @@ from queries_add import (
 )
 
 
+# Static menu text, built once at import and written with a single call each time it is shown
+_BANNER = (f"\n{'=' * MENU_WIDTH}\n{'Flight Management System':^{MENU_WIDTH}}\n"
+           f"{'=' * MENU_WIDTH}\n\n")
+
+_MAIN_MENU = section_header("Main Menu", MENU_WIDTH) + """
+1) View/Filter flights
+2) Modify flight
+3) Add new data
+4) Summary reports
+0) Exit
+        
+"""
+
+_VIEW_FLIGHTS_HEADER = section_header("Filter Flights", MENU_WIDTH) + "Leave blank to skip any filter\n\n"
+
+_MODIFY_FLIGHT_HEADER = section_header("Modify Flight", MENU_WIDTH)
+
+_MODIFY_FLIGHT_MENU = """
+    1) Change departure/arrival times
+    2) Change status
+    3) Change route (origin & destination)
+    4) Reassign captain
+    5) Reassign first officer
+    0) Back to main menu
+    
+"""
+
+_ADD_DATA_MENU = section_header("Add New Data", MENU_WIDTH) + """
+    1) New airport
+    2) New Route 
+    3) New pilot
+    4) New flight
+    5) Assign captain to flight
+    0) Back to main menu
+    
+"""
+
+_SUMMARIES_MENU = section_header("Summary Reports", MENU_WIDTH) + """
+    1) Flights per destination
+    2) Flights per destination (date range)
+    3) Flights per pilot
+    4) Flights by status
+    5) Top busiest routes
+    6) All pilots
+    7) All airports
+    0) Back to main menu
+    
+"""
+
+
 def menu_view_flights():
     """Request user input to select flight by filter""" 
-    print_section_header("Filter Flights", MENU_WIDTH)
-    print("Leave blank to skip any filter\n")
+    sys.stdout.write(_VIEW_FLIGHTS_HEADER)
     
     # get filter criteria from user
     origin = safe_input("Origin code: ",allow_blank=True)
@@ -35,29 +86,23 @@ def menu_view_flights():
     captain_id = safe_input("Captain ID: ", int ,allow_blank=True)
     
     # Query the database for flights matching the provided filters
-    flights = get_flights(origin, dest, status, date_from, date_to, captain_id)
+    # Fetched in chunks so the table starts printing before every row has been read
+    headers, chunks = get_flights(origin, dest, status, date_from, date_to, captain_id, chunksize=500)
 
     # Show results
-    format_flight_table(flights)
+    format_flight_table(headers, chain.from_iterable(chunks))
 
 
 def menu_modify_flight():
     """Request user input to modify a flight"""
-    print_section_header("Modify Flight", MENU_WIDTH)
+    sys.stdout.write(_MODIFY_FLIGHT_HEADER)
     
      # Identify the flight to modify. Flight number is not unique but (Flight number, flight date) is unique
     flight_number = safe_input("Flight number: ")
     flight_date = safe_input("Flight date (YYYY-MM-DD): ")
     
     # Present modification options to the user
-    print("""
-    1) Change departure/arrival times
-    2) Change status
-    3) Change route (origin & destination)
-    4) Reassign captain
-    5) Reassign first officer
-    0) Back to main menu
-    """)
+    sys.stdout.write(_MODIFY_FLIGHT_MENU)
     
     choice = safe_input("Choice (0-5): ")
     
@@ -91,15 +136,7 @@ def menu_modify_flight():
 def menu_add_data():
     """Prompt user to add new airports, routes, pilots, flights or assign captains"""
     
-    print_section_header("Add New Data", MENU_WIDTH)
-    print("""
-    1) New airport
-    2) New Route 
-    3) New pilot
-    4) New flight
-    5) Assign captain to flight
-    0) Back to main menu
-    """)
+    sys.stdout.write(_ADD_DATA_MENU)
     
     choice = safe_input("Choice (0-5): ")
     
@@ -156,17 +193,7 @@ def menu_add_data():
 
 def menu_summaries():
     """Show summary reports"""
-    print_section_header("Summary Reports", MENU_WIDTH)
-    print("""
-    1) Flights per destination
-    2) Flights per destination (date range)
-    3) Flights per pilot
-    4) Flights by status
-    5) Top busiest routes
-    6) All pilots
-    7) All airports
-    0) Back to main menu
-    """)
+    sys.stdout.write(_SUMMARIES_MENU)
     
     choice = safe_input("Choice (0-7): ")
     
@@ -193,9 +220,7 @@ def main_menu():
     """Entry point for the CLI — initialise the database and display main menu"""
     
     # Print borders for styling + improved user experience
-    print("\n" + "=" * MENU_WIDTH)
-    print(f"{'Flight Management System':^{MENU_WIDTH}}")
-    print("=" * MENU_WIDTH + "\n")
+    sys.stdout.write(_BANNER)
     
     try:
         # Initalise the database
@@ -206,14 +231,7 @@ def main_menu():
     
     # Main interaction loop
     while True:
-        print_section_header("Main Menu", MENU_WIDTH)
-        print("""
-1) View/Filter flights
-2) Modify flight
-3) Add new data
-4) Summary reports
-0) Exit
-        """)
+        sys.stdout.write(_MAIN_MENU)
         
         choice = safe_input("Select option (0-4): ")
         
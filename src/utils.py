@@ -2,88 +2,98 @@
 Functions for formatting and handling user inputs 
 """
 
-from typing import List, Optional, Any
+from array import array
+from itertools import chain, islice
+from typing import List, Optional, Any, Iterable, Sequence
 import sqlite3
-import pandas as pd
+import sys
+
+
+def section_header(title: str, width: int = 50) -> str:
+    """Return a section header (title between two rules) as a single string"""
+    return f"\n{'=' * width}\n{title:^{width}}\n{'=' * width}\n\n"
 
 
 def print_section_header(title: str, width: int = 50):
-    print(f"\n{'=' * width}")
-    print(f"{title:^{width}}")
-    print(f"{'=' * width}\n")
+    sys.stdout.write(section_header(title, width))
+
+def format_flight_table(headers: List[str], flights: Iterable[tuple]) -> None:
+    """Format and prepare flight data for table display
+
+    flights can be a list or any iterator of rows, rows are printed as they arrive
+    """
 
-def format_flight_table(flights) -> None:
-    """Format and prepare flight data for table display"""
+    flights = iter(flights)
+    first = next(flights, None)
 
     # If the flight list is empty, error and exit
-    if not flights:
+    if first is None:
         print("No flights found matching the criteria. Sorry!")
         return
     
-    flight_data = []
-    for flight in flights:
-        flight_dict = dict(flight) # Convert each flight object to a dictionary
+    # Positions of the columns to show, leaving out internal identifiers
+    keep_idx = [i for i, h in enumerate(headers) if h not in ('flight_id', 'captain_id', 'fo_id')]
+
+    print("\n")
+    total = _print_table([headers[i] for i in keep_idx],
+                         ([flight[i] for i in keep_idx] for flight in chain((first,), flights)))
+    print(f"\nTotal flights: {total}")
 
-        # Remove internal identifiers that shouldn't be displayed
-        flight_dict.pop('flight_id', None)
-        flight_dict.pop('captain_id', None)
-        flight_dict.pop('fo_id', None)
 
-        flight_data.append(flight_dict)
-    
-    if not flight_data: # Exit without warning if data is empty after cleaning
+def format_summary_table(headers: List[str], rows: List[Any], title: str) -> None:
+    print_section_header(title)
+    if not rows: # If a table has no data...
+        print("No data available. Sorry!")
         return
     
-    
-    
-    headers = list(flight_data[0].keys())
-    
-    # Calculate the maximum width for each column based on the header name and the longest data entry
+    _print_table(headers, rows)
 
-    col_widths = {}
-    for header in headers:
-        # maximum width of the data in this column
-        max_data_width = max(len(str(row.get(header, ""))) for row in flight_data)
-        col_widths[header] = max(len(header), max_data_width)
-    
 
-    print("\n")
+# Rows held in memory at once by _print_table; the first batch also sets the column widths
+_TABLE_BATCH = 1000
 
-    # Print the top border line (total width = sum of column widths + padding)
-    
-    print("-" * (sum(col_widths.values()) + len(headers) * 3 + 1))
 
-    # header row with each header centered within its column width
-    header_row = "| "
-    for header in headers:
-        header_row += f"{header:^{col_widths[header]}} | "
-    print(header_row)
+def _print_table(headers: List[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Print rows as a bordered table, each value centred in its column
 
-    # Print another border line below the headers, same logic as above
-    print("-" * (sum(col_widths.values()) + len(headers) * 3 + 1))
-    
-    # Print data rows
-    for row in flight_data:
-        data_row = "| "
-        for header in headers:
-            value = str(row.get(header, ''))
-
-            data_row += f"{value:^{col_widths[header]}} | "
-        
-        print(data_row)
-    
-    print("-" * (sum(col_widths.values()) + len(headers) * 3 + 1))
-    print(f"\nTotal flights: {len(flights)}")
+    Shared by the flight listing and the summary reports, rows are indexed by position.
+    Column widths come from the first _TABLE_BATCH rows, later rows are streamed with
+    those widths and any longer value is cut to fit its column. Returns the number of rows
+    """
 
+    rows = iter(rows)
 
-def format_summary_table(df: pd.DataFrame, title: str) -> None:
-    print_section_header(title)
-    if df.empty: # If a table has no data...
-        print("No data available. Sorry!")
-        return
-    
-    print(df.to_string(index=False)) # Print table as string without the index column
+    # Stringify every cell once, widening each column to its longest entry as we go
+    col_widths = array('i', map(len, headers)) # Fixed-size int buffer updated in place
+    rendered = []
+    for row in islice(rows, _TABLE_BATCH):
+        cells = [str(value) for value in row]
+        for i, cell in enumerate(cells):
+            if len(cell) > col_widths[i]:
+                col_widths[i] = len(cell)
+        rendered.append(cells)
+
+    # One format string per table, each value centred within its column width
+    row_format = "| " + "".join(f"{{:^{w}}} | " for w in col_widths)
+
+    # Border line above and below the headers and at the end (total width = sum of column widths + padding)
+    border = "-" * (sum(col_widths) + len(headers) * 3 + 1)
+
+    lines = [border, row_format.format(*headers), border]
+    # Data rows
+    lines.extend(row_format.format(*cells) for cells in rendered)
+    count = len(rendered)
 
+    # Stream whatever is left in batches, one write per batch
+    while batch := list(islice(rows, _TABLE_BATCH)):
+        print("\n".join(lines))
+        lines = [row_format.format(*[str(value)[:w] for value, w in zip(row, col_widths)])
+                 for row in batch]
+        count += len(batch)
+
+    lines.append(border)
+    print("\n".join(lines))
+    return count
 
 
 def format_preview(old: dict, new: dict):
@@ -96,32 +106,33 @@ def format_preview(old: dict, new: dict):
     Prints diff highlighting any fields that have changed
     """
 
-     # Print the current values
-    print("\n--- Current ---")
-    for k, v in old.items():
-        if k not in ("flight_id",): # Skip flight_id from display
-            print(f"{k:<20}: {v}")
+    # Current values, skipping flight_id from display
+    lines = ["\n--- Current ---"]
+    lines.extend(f"{k:<20}: {v}" for k, v in old.items() if k != "flight_id")
     
-    # Print the new  values
-    print("\n--- Proposed ---")
-    changes = [] # List to track the fields that have changed
-    for k, v in new.items():
-        if k in old and old[k] != v:
-            changes.append(k)
-            print(f"{k:<20}: {v} [CHANGED]")
-        else:
-            print(f"{k:<20}: {v}")
+    # New values, flagging the fields that have changed
+    lines.append("\n--- Proposed ---")
+    changes = [k for k, v in new.items() if k in old and old[k] != v]
+    changed = set(changes)
+    lines.extend(f"{k:<20}: {v} [CHANGED]" if k in changed else f"{k:<20}: {v}"
+                 for k, v in new.items())
     
-    # Print changes
+    # Summary of changes
     if changes:
-        print(f"\nChanges: {', '.join(changes)}")
+        lines.append(f"\nChanges: {', '.join(changes)}")
     else:
-        print("No changes detected.")
+        lines.append("No changes detected.")
+
+    print("\n".join(lines)) # Whole preview in a single write
+
 
+# Converters used by safe_input, any other type is returned as a string
+_CONVERTERS = {int: int, float: float, str: str}
 
 
 def safe_input(prompt: str, input_type=str, allow_blank=False):
     """Safely get user input,  ensuring the correct type and handling blank input"""
+    convert = _CONVERTERS.get(input_type, str)
     while True:
         try:
             value = input(prompt).strip()
@@ -131,11 +142,7 @@ def safe_input(prompt: str, input_type=str, allow_blank=False):
                 print("This field cannot be empty.")
                 continue
             # Try converting input to the specified type
-            if input_type == int:
-                return int(value)
-            elif input_type == float:
-                return float(value)
-            return value # Return as string by default
+            return convert(value)
         except ValueError:
             # If the conversion fails notify user to try again
             print(f"Invalid input. Please enter a valid {input_type.__name__}.")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The application modules import each other as top-level modules from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A freshly seeded database in a temporary directory"""
+    monkeypatch.chdir(tmp_path) # DB_PATH is relative to the working directory
+    database.initialise_tables()
+    yield
+    database.close_connection()
+
+
+def count(sql, params=()):
+    with database.get_connection() as conn:
+        return conn.execute(sql, params).fetchone()[0]
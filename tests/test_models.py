@@ -0,0 +1,25 @@
+import pytest
+
+from models import (
+    ValidationError, validate_airport_code, validate_flight_number, validate_licence_number
+)
+
+
+@pytest.mark.parametrize("validate, value, expected", [
+    (validate_airport_code, " lhr ", "LHR"),
+    (validate_flight_number, "ba101", "BA101"),
+    (validate_licence_number, "lic-1001", "LIC-1001"),
+])
+def test_identifiers_are_upper_cased_after_validation(validate, value, expected):
+    assert validate(value) == expected
+
+
+@pytest.mark.parametrize("validate, value", [
+    (validate_airport_code, "ßa"),   # upper() would give 'SSA'
+    (validate_airport_code, "ſfo"),  # long s folds to 's' under Unicode IGNORECASE
+    (validate_flight_number, "baß1"),
+    (validate_licence_number, "lic-ß"),
+])
+def test_non_ascii_identifiers_are_rejected(validate, value):
+    with pytest.raises(ValidationError):
+        validate(value)
@@ -0,0 +1,40 @@
+import builtins
+
+import pytest
+
+import queries
+from conftest import count
+
+
+@pytest.fixture
+def delete_on_confirm(monkeypatch):
+    """Answer 'y' to the prompt, but delete the flight first as another session might"""
+    def answer(prompt=""):
+        with queries.get_connection() as conn:
+            conn.execute("DELETE FROM Flight WHERE flight_number = 'BA101' AND flight_date = '2025-06-05'")
+        return "y"
+    monkeypatch.setattr(builtins, "input", answer)
+
+
+@pytest.mark.parametrize("change, args", [
+    (queries.change_route, ("LHR", "AMS")),
+    (queries.change_times, ("2025-06-05 09:00", "2025-06-05 16:00")),
+    (queries.change_status, ("Delayed",)),
+])
+def test_change_reports_flight_removed_after_preview(db, capsys, delete_on_confirm, change, args):
+    change("BA101", "2025-06-05", *args)
+    out = capsys.readouterr().out
+    assert out.rstrip().endswith("No flight found for BA101 on 2025-06-05")
+    assert "successfully" not in out
+    assert count("SELECT COUNT(*) FROM Route WHERE origin_code = 'LHR' AND dest_code = 'AMS'") == 0
+
+
+def test_change_route_announces_a_new_route_once(db, capsys, monkeypatch):
+    monkeypatch.setattr(builtins, "input", lambda prompt="": "y")
+    queries.change_route("BA101", "2025-06-05", "LHR", "AMS")
+    assert "Created new route LHR -> AMS\nRoute updated successfully" in capsys.readouterr().out
+
+    queries.change_route("BA102", "2025-06-06", "LHR", "AMS", confirm=False)
+    out = capsys.readouterr().out
+    assert "Created new route" not in out and "Route updated successfully" in out
+    assert count("SELECT COUNT(*) FROM flight_details_mv WHERE origin_code = 'LHR' AND dest_code = 'AMS'") == 2
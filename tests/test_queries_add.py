@@ -0,0 +1,56 @@
+from conftest import count
+from queries_add import add_airports_bulk, add_pilots_bulk, add_routes_bulk
+
+
+def test_airports_bulk_adds_every_row(db, capsys):
+    add_airports_bulk([
+        ("qqa", "Alpha", "City", "Country", 1.0, "Europe/X"),
+        ("QQB", "Beta", "City", "Country", "2", "Europe/X"),
+    ])
+    assert "2 airports added successfully" in capsys.readouterr().out
+    assert count("SELECT COUNT(*) FROM Airport WHERE airport_code IN ('QQA', 'QQB')") == 2
+
+
+def test_airports_bulk_duplicate_rolls_back_whole_batch(db, capsys):
+    before = count("SELECT COUNT(*) FROM Airport")
+    add_airports_bulk([
+        ("QQA", "Alpha", "City", "Country", 1.0, "Europe/X"),
+        ("QQB", "Beta", "City", "Country", 1.0, "Europe/X"),
+        ("QQA", "Alpha again", "City", "Country", 1.0, "Europe/X"),
+    ])
+    # Constraint errors reach the caller wrapped by get_connection as DatabaseError
+    assert capsys.readouterr().out.strip() == "Database Error: UNIQUE constraint failed: Airport.airport_code"
+    assert count("SELECT COUNT(*) FROM Airport") == before
+    assert count("SELECT COUNT(*) FROM Airport WHERE airport_code IN ('QQA', 'QQB')") == 0
+
+
+def test_airports_bulk_short_row_is_reported(db, capsys):
+    before = count("SELECT COUNT(*) FROM Airport")
+    add_airports_bulk([("QQA", "Alpha", "City", "Country", 1.0, "Europe/X"), ("ZZ",)])
+    assert capsys.readouterr().out.strip() == "Row 2: expected 6 values, got 1"
+    assert count("SELECT COUNT(*) FROM Airport") == before
+
+
+def test_routes_bulk_long_row_and_bad_number_are_reported(db, capsys):
+    add_routes_bulk([("LHR", "CDG", 340, 70, "extra")])
+    assert capsys.readouterr().out.strip() == "Row 1: expected 4 values, got 5"
+    add_routes_bulk([("LHR", "CDG", 340, 70), ("LHR", "FRA", "far", 90)])
+    assert capsys.readouterr().out.startswith("Row 2: ")
+    assert count("SELECT COUNT(*) FROM Route WHERE origin_code = 'LHR' AND dest_code IN ('CDG', 'FRA')") == 0
+
+
+def test_pilots_bulk_invalid_value_names_the_row(db, capsys):
+    before = count("SELECT COUNT(*) FROM Pilot")
+    add_pilots_bulk([
+        ("B-1", "Ann", "Able", "captain", "2020-01-01"),
+        ("B-2", "Ben", "Baker", "pilot", "2021-01-01"),
+    ])
+    assert capsys.readouterr().out.startswith("Row 2: Rank must be one of")
+    assert count("SELECT COUNT(*) FROM Pilot") == before
+
+
+def test_routes_bulk_unknown_airport_rolls_back_whole_batch(db, capsys):
+    before = count("SELECT COUNT(*) FROM Route")
+    add_routes_bulk([("LHR", "CDG", 340, 70), ("LHR", "ZZZ", 100, 30)])
+    assert capsys.readouterr().out.strip() == "Database Error: FOREIGN KEY constraint failed"
+    assert count("SELECT COUNT(*) FROM Route") == before
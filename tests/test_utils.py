@@ -0,0 +1,17 @@
+import utils
+from utils import format_flight_table
+
+
+def test_streamed_rows_keep_the_calibrated_widths(capsys):
+    headers = ["flight_id", "flight_number", "captain_name"]
+    rows = [(i, f"BA{i}", "Ann Able") for i in range(utils._TABLE_BATCH + 500)]
+    rows[utils._TABLE_BATCH + 200] = (0, "BA-WIDE", "A much longer captain name than any before")
+
+    format_flight_table(headers, iter(rows))
+
+    out = capsys.readouterr().out
+    table = [line for line in out.splitlines() if line.startswith("|")]
+    assert len(table) == len(rows) + 1 # Header and every row
+    assert len({len(line) for line in table}) == 1 # Every row lines up with the header
+    assert "A much longer captain name" not in out # Cut to the calibrated column width
+    assert f"Total flights: {len(rows)}" in out